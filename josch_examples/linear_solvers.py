@@ -45,9 +45,11 @@ y = np.array([3, 6])
 
 # Solve.
 x = np.linalg.inv(A).dot(y)
+x_solve = np.linalg.solve(A, y)
 
 # Print result.
 print(f"{x = !s}")
+print(f"{x_solve = !s} (same result via `solve`, see below)")
 
 # %%
 # .. warning::
@@ -59,7 +61,9 @@ print(f"{x = !s}")
 #
 # Solve
 # -----
-# It is better to let numpy solve this for you:
+# It is better to let numpy (`np.linalg.solve`) or scipy solve this for you.
+# Scipy's version additionally lets you skip the check for non-finite
+# values in the input and tell it about the structure of the matrix:
 
 # Generate data.
 A = np.array([[1, 2], 
@@ -67,7 +71,24 @@ A = np.array([[1, 2],
 y = np.array([3, 6])
 
 # Solve.
-x = np.linalg.solve(A, y)
+x = scipy.linalg.solve(A, y, assume_a="gen", check_finite=False)
+
+# Print result.
+print(f"{x = !s}")
+
+# %%
+# If A is symmetric and positive definite, ``assume_a="pos"`` uses a
+# Cholesky decomposition, which needs about half the operations of the
+# general LU decomposition.
+# (For large, sparse matrices have a look at `scipy.sparse.linalg.spsolve`.)
+
+# Generate data.
+A = np.array([[4, 2], 
+              [2, 3]])
+y = np.array([3, 6])
+
+# Solve.
+x = scipy.linalg.solve(A, y, assume_a="pos", check_finite=False)
 
 # Print result.
 print(f"{x = !s}")
@@ -88,7 +109,7 @@ try:
 except np.linalg.LinAlgError as e:
     print(f"1) {e.__class__.__name__}: {e!s}")
 
-# 3) Solve with `solve` function.
+# 2) Solve with `solve` function.
 try:
     x = np.linalg.solve(A, y)
 except np.linalg.LinAlgError as e:
@@ -98,12 +119,19 @@ except np.linalg.LinAlgError as e:
 # Least Squares
 # -------------
 # Yet, we can still find a solution for x
-# via the linear least squares algorithm implemented in numpy.
+# via the linear least squares algorithm implemented in scipy
+# (and numpy, as `np.linalg.lstsq`).
 # It finds the x that minimizes the norm of the residual: 
 #
 # .. math::
 #       \min_{x} \left\lVert A \cdot x - y \right\rVert
 #
+# For these small systems, the `gelsy` LAPACK driver (complete orthogonal
+# factorization) is cheaper than the SVD-based default `gelsd`,
+# but it does not return the singular values of A
+# and, even for overdetermined systems, no residuals either.
+# Use ``lapack_driver="gelss"`` if you need them.
+#
 # In *underdetermined* systems it finds an *exact* solution:
 #
 
@@ -113,18 +141,18 @@ A = np.array([[1, 2, 5],
 y = np.array([3, 6])
 
 # Solve.
-x, residuals, rank, sv = np.linalg.lstsq(A, y, rcond=None)
+x, residuals, rank, _ = scipy.linalg.lstsq(A, y, lapack_driver="gelsy", check_finite=False)
 
 # Print result.
 print(f"{x = !s}")
 print(f"{A @ x = !s}")
 print(f"{residuals = !s}")
 print(f"{rank = !s}  (of A)")
-print(f"{sv = !s} (singular values of A)")
 
 # %%
 # And the same function optimizes the residuals for
 # an *overdetermined* equation system. 
+# To get the residuals (and singular values), we use the `gelss` driver here.
 #
 
 # Generate data.
@@ -134,7 +162,7 @@ A = np.array([[1, 1],
 y = np.array([3, 6, 8])
 
 # Solve.
-x, residuals, rank, sv = np.linalg.lstsq(A, y, rcond=None)
+x, residuals, rank, sv = scipy.linalg.lstsq(A, y, lapack_driver="gelss", check_finite=False)
 
 # Print result.
 print(f"{x = !s}")
@@ -143,6 +171,26 @@ print(f"{residuals  = !s}")
 print(f"{rank = !s}  (of A)")
 print(f"{sv = !s} (singular values of A)")
 
+# %%
+# Many Systems
+# ------------
+# If you need to solve many small systems of the same size,
+# don't loop over them in python. `np.linalg.solve` accepts stacks of matrices
+# and solves all of them in a single call, avoiding the per-call overhead:
+#
+
+# Generate data.
+np.random.seed(1)
+As = np.random.randn(1000, 3, 3)
+ys = np.random.randn(1000, 3)
+
+# Solve (the trailing axis makes ys a stack of column vectors).
+xs = np.linalg.solve(As, ys[..., np.newaxis])[..., 0]
+
+# Print result.
+print(f"{xs.shape = !s}")
+print(f"{np.allclose(np.einsum('nij,nj->ni', As, xs), ys) = !s}")
+
 # %%
 # Linear Equations with constraints
 # =================================
@@ -175,7 +223,10 @@ print(f"{sv = !s} (singular values of A)")
 # Where we can set :math:`c` to zero, as we don't care about the minimization.
 # Using the linear least-squares example above, we had one value > 0.6.
 # Let us force all values of x to be below 0.6. 
-# We only need to plug-in our equality system (eq) and the bounds:
+# We only need to plug-in our equality system (eq) and the bounds.
+# We choose the `HiGHS <https://highs.dev>`_ solvers, which are much faster
+# than the legacy `simplex` and `interior-point` methods.
+# For larger systems, `A_eq` and `A_ub` can also be given as sparse matrices.
 #
 
 # Generate data.
@@ -185,14 +236,14 @@ y = np.array([3, 6])
 c = np.zeros(A.shape[1])
 
 # Solve.
-result = scipy.optimize.linprog(c=c, A_ub=None, b_ub=None, A_eq=A, b_eq=y, bounds=[[None, 0.6]]*3)
+result = scipy.optimize.linprog(c=c, A_ub=None, b_ub=None, A_eq=A, b_eq=y, bounds=[[None, 0.6]]*3, method="highs")
 x = result.x
 
 # Print result.
 print(result.message)
 print(f"{x = !s}")
 print(f"{A @ x = !s}")
-print(f"{result.con = !s} (i.e. residuals)")
+print(f"{A @ x - y = !s} (i.e. residuals)")
 
 # %%
 # Alternatively, or if our bounds come from another equation system, 
@@ -208,7 +259,7 @@ z = 0.6 * np.ones(B.shape[1])
 c = np.zeros(A.shape[1])
 
 # Solve.
-result = scipy.optimize.linprog(c=c, A_ub=B, b_ub=z, A_eq=A, b_eq=y, bounds=None)
+result = scipy.optimize.linprog(c=c, A_ub=B, b_ub=z, A_eq=A, b_eq=y, bounds=None, method="highs")
 x = result.x
 
 # Print result.
@@ -216,7 +267,7 @@ print(result.message)
 print(f"{x = !s}")
 print(f"{A @ x = !s}")
 print(f"{result.slack = !s} (i.e. z - x)")
-print(f"{result.con = !s} (i.e. residuals)")
+print(f"{A @ x - y = !s} (i.e. residuals)")
 
 # %%
 # However, this does **not** minimize 
@@ -228,17 +279,51 @@ np.random.seed(1)
 A = np.random.randn(m, n)
 b = np.random.randn(m)
 
-# Define and solve the CVXPY problem.
+# Define the CVXPY problem.
+# Using parameters for A and b, the problem is only canonicalized once
+# and can be re-solved cheaply with new values.
+A_p = cp.Parameter((m, n))
+b_p = cp.Parameter(m)
 x = cp.Variable(n)
-cost = cp.sum_squares(A @ x - b)
+cost = cp.sum_squares(A_p @ x - b_p)
 prob = cp.Problem(cp.Minimize(cost))
-prob.solve()
+
+# Solve.
+A_p.value = A
+b_p.value = b
+prob.solve(warm_start=True)
 
 # Print result.
 print("\nThe optimal value is", prob.value)
 print("The optimal x is")
 print(x.value)
-print("The norm of the residual is ", cp.norm(A @ x - b, p=2).value)
+print("The norm of the residual is ", np.linalg.norm(A @ x.value - b))
+
+# %%
+# Re-solving for different data only requires updating the parameter values:
+
+# Generate data.
+b = np.random.randn(m)
+
+# Solve.
+b_p.value = b
+prob.solve(warm_start=True)
+
+# Print result.
+print("\nThe optimal value is", prob.value)
+print("The norm of the residual is ", np.linalg.norm(A @ x.value - b))
+
+# %%
+# Without any constraints, though, this is just the least-squares problem from above.
+# Instead of building and canonicalizing a problem for a general-purpose
+# solver, a single call to `lstsq` gives the same result orders of magnitude faster:
+
+# Solve.
+x_direct, *_ = scipy.linalg.lstsq(A, b, lapack_driver="gelsy", check_finite=False)
+
+# Print result.
+print(f"{np.allclose(x_direct, x.value, atol=1e-6) = !s}")
+print("The norm of the residual is ", np.linalg.norm(A @ x_direct - b))
 
 # %%
 # Nonlinear Optimization
@@ -252,7 +337,7 @@ print("The norm of the residual is ", cp.norm(A @ x - b, p=2).value)
 # - | `scipy.optimize.curve_fit(f, xdata, ydata, p0=None, sigma=None, absolute_sigma=False, check_finite=True, bounds=(- inf, inf)) <https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.curve_fit.html#scipy.optimize.curve_fit>`_ 
 #   | Use non-linear least squares to fit a function, f, to data. *(Basically a wrapper around least_squares)*
 #
-# - | `scipy.optimize.linprog(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=None, method='interior-point', callback=None, options=None, x0=None) <https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.linprog.html>`_ 
+# - | `scipy.optimize.linprog(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=None, method='highs', callback=None, options=None, x0=None) <https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.linprog.html>`_ 
 #   | Linear programming: minimize a linear objective function subject to linear equality and inequality constraints.
 #   
 # 
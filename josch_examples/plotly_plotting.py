@@ -22,9 +22,16 @@ fig
 # %%
 # Ignore this
 # ===========
-# Create Thumbnail for the Sphinx-Gallery:
+# Create Thumbnail for the Sphinx-Gallery
+# (only if it is outdated, as starting kaleido takes a few seconds):
 from pathlib import Path 
-if Path("../docs/gallery").exists():
-    fig.write_image("../docs/gallery/_thumb_plotly_plotting.png")
+thumb = Path("../docs/gallery/_thumb_plotly_plotting.png")
+source = globals().get("__file__")  # not defined in notebooks/interactive sessions
+if thumb.parent.exists() and (
+    not thumb.exists() 
+    or source is None 
+    or thumb.stat().st_mtime < Path(source).stat().st_mtime
+):
+    fig.write_image(thumb)
 # sphinx_gallery_thumbnail_path = 'gallery/_thumb_plotly_plotting.png'
 # %%
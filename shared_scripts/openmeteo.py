@@ -4,25 +4,22 @@ OpenMeteo Forecast Extractor
 
 Extract historical and forecast data from OpenMeteo and show it in a plotly graph.
 
-Required packages:
-openmeteo-py, pandas, plotly
+Required packages (Python >= 3.10):
+aiohttp, numpy, pandas, plotly, pytz
 """
-from typing import Sequence
-from openmeteo_py import OWmanager
-from openmeteo_py.Hourly.HourlyForecast import HourlyForecast
-from openmeteo_py.Hourly.HourlyHistorical import HourlyHistorical
-from openmeteo_py.Options.ForecastOptions import ForecastOptions
-from openmeteo_py.Options.HistoricalOptions import HistoricalOptions
-from openmeteo_py.Utils.constants import celsius, kmh, mm, iso8601 
+import asyncio
+from typing import Sequence, Tuple
+import aiohttp
 import pytz
+import numpy as np
 import pandas as pd
 
 import plotly.graph_objects as go
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     """Class to store information about a location and its weather data."""
     name: str
@@ -31,25 +28,39 @@ class Location:
     timezone: pytz.timezone = pytz.utc
     data: pd.DataFrame = None
 
-    def copy(self):
-        return Location(self.name, self.latitude, self.longitude, self.timezone, self.data)
+    def with_data(self, data: pd.DataFrame) -> "Location":
+        """Return a copy of this location with the given weather data."""
+        return replace(self, data=data)
 
 
 GENEVA = Location("Geneva", 46.2052193, 6.1471942, pytz.timezone('Europe/Zurich'))
 BERN = Location("Bern", 46.9546812, 7.3125359, pytz.timezone('Europe/Zurich'))
 
-color_order = [
-    (31, 119, 180),
-    (255, 127, 14),
-    (44, 160, 44),
-    (214, 39, 40),
-    (148, 103, 189),
-    (140, 86, 75),
-    (227, 119, 194),
-    (127, 127, 127),
-    (188, 189, 34),
-    (23, 190, 207),
-]
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+HISTORICAL_URL = "https://archive-api.open-meteo.com/v1/archive"
+TIME_FORMAT = '%Y-%m-%dT%H:%M'  # format of the returned time-strings
+
+color_order = np.array([
+    [31, 119, 180],
+    [255, 127, 14],
+    [44, 160, 44],
+    [214, 39, 40],
+    [148, 103, 189],
+    [140, 86, 75],
+    [227, 119, 194],
+    [127, 127, 127],
+    [188, 189, 34],
+    [23, 190, 207],
+], dtype=np.uint8)
+
+
+def _rgba_strings(alpha: float) -> list:
+    """Format all colors of the color cycle as plotly rgba-strings with the given alpha."""
+    return ['rgba({}, {}, {}, {})'.format(r, g, b, alpha) for r, g, b in color_order.tolist()]
+
+
+# alpha -> rgba-strings of the whole color cycle, precomputed for the alphas used in plot()
+_COLOR_STRINGS = {alpha: _rgba_strings(alpha) for alpha in (1., 0.4, 0.2)}
 
 
 def get_color(idx: int, alpha: float = 1.) -> str:
@@ -62,8 +73,11 @@ def get_color(idx: int, alpha: float = 1.) -> str:
     Returns:
         str: String representation of the color for plotly in rgba format. 
     """
-    color = color_order[idx % len(color_order)]
-    return 'rgba({}, {}, {}, {})'.format(*color, alpha)
+    try:
+        colors = _COLOR_STRINGS[alpha]
+    except KeyError:
+        colors = _COLOR_STRINGS[alpha] = _rgba_strings(alpha)
+    return colors[idx % len(colors)]
 
 
 
@@ -93,87 +107,140 @@ def check_error(data: dict) -> None:
         pass
 
 
-def get_forecast(location: Location) -> pd.DataFrame:
+def get_options(location: Location) -> dict:
+    """Return the request parameters common to forecast and historical data.
+
+    Args:
+        location (Location): Location description of the place you want the data from.
+
+    Returns:
+        dict: Query parameters for the OpenMeteo API.
+    """
+    return dict(
+        latitude=location.latitude,
+        longitude=location.longitude,
+        hourly="temperature_2m",
+        temperature_unit="celsius",
+        windspeed_unit="kmh",
+        precipitation_unit="mm",
+        timeformat="iso8601",
+        timezone=str(location.timezone),
+    )
+
+
+def hourly_to_dataframe(hourly: dict) -> pd.DataFrame:
+    """Convert the hourly data returned from OpenMeteo into a DataFrame.
+
+    Args:
+        hourly (dict): Hourly data, containing the time-strings in `time`. 
+
+    Returns:
+        pd.DataFrame: Pandas DataFrame with the data indexed by time.
+    """
+    index = pd.to_datetime(hourly.pop("time"), format=TIME_FORMAT, cache=True)
+    df = pd.DataFrame(hourly, index=index)
+    df.index.name = "time"
+    return df
+
+
+async def request_data(session: aiohttp.ClientSession, url: str, params: dict) -> dict:
+    """Request data from the OpenMeteo API.
+
+    Args:
+        session (aiohttp.ClientSession): Session to send the request with.
+        url (str): URL of the API endpoint.
+        params (dict): Query parameters of the request.
+
+    Returns:
+        dict: Returned (from json converted) dict object from OpenMeteo.
+    """
+    async with session.get(url, params=params) as response:
+        # errors are also returned as json, with a reason
+        meteo = await response.json()
+    check_error(meteo)
+    return meteo
+
+
+async def get_forecast(session: aiohttp.ClientSession, location: Location) -> pd.DataFrame:
     """Return the forecast data for the given location.
 
     Args:
+        session (aiohttp.ClientSession): Session to send the request with.
         location (Location): Location description of the place you want the forecast from.
 
     Returns:
         pd.DataFrame: Pandas DataFrame containing the requested forecast data.
     """
-    hourly = HourlyHistorical()
-    hourly.temperature_2m()
-
-    options = ForecastOptions(
-        latitude=location.latitude,
-        longitude=location.longitude,
-        current_weather=False,
-        temperature_unit=celsius,
-        windspeed_unit=kmh,
-        precipitation_unit=mm,
-        timeformat=iso8601,
-        timezone=location.timezone,
+    params = get_options(location)
+    params.update(
         past_days=30,
         forecast_days=16,
     )
 
-    mgr = OWmanager(
-        options=options,
-        api=OWmanager.forecast,
-        hourly=hourly
-    )
-
-    meteo = mgr.get_data()
-    check_error(meteo)
-    df = pd.DataFrame(meteo["hourly"])
-    df = df.set_index("time", drop=True)
+    meteo = await request_data(session, FORECAST_URL, params)
+    df = hourly_to_dataframe(meteo["hourly"])
     df = df.rename(columns={"temperature_2m": "forecast"})
     return df
     
 
-def get_historical(location: Location, start_date: datetime) -> pd.DataFrame:
+async def get_historical(session: aiohttp.ClientSession, location: Location, start_date: datetime, end_date: datetime) -> pd.DataFrame:
     """Return the historical data for the given location.
 
     Args:
+        session (aiohttp.ClientSession): Session to send the request with.
         location (Location): Location description of the place you want the forecast from.
         start_date (datetime): Start date of the historical data. 
-        The end date will be the closest historical data available to the current date.
+        end_date (datetime): End date of the historical data, usually the current date.
+        The data will end with the closest historical data available to this date.
 
     Returns:
         pd.DataFrame: Pandas DataFrame containing the requested historical data.
     """
-    hourly = HourlyForecast()
-    hourly.temperature_2m()
-
-    options = HistoricalOptions(
-        latitude=location.latitude,
-        longitude=location.longitude,
-        current_weather=False,
-        temperature_unit = celsius,
-        windspeed_unit = kmh,
-        precipitation_unit = mm,
-        timeformat = iso8601,
-        timezone = location.timezone,
+    params = get_options(location)
+    params.update(
         start_date=iso8601format(start_date),
-        end_date=iso8601format(datetime.now()),
+        end_date=iso8601format(end_date),
     )
 
-    mgr = OWmanager(
-        options=options,
-        api=OWmanager.historical,
-        hourly=hourly
-    )
-
-    meteo = mgr.get_data()
-    check_error(meteo)
-    df = pd.DataFrame(meteo["hourly"])
-    df = df.set_index("time", drop=True)
+    meteo = await request_data(session, HISTORICAL_URL, params)
+    df = hourly_to_dataframe(meteo["hourly"])
     df = df.rename(columns={"temperature_2m": "historical"})
 
     return df
 
 
+async def get_all_data(locations: Sequence[Location], start_date: datetime, end_date: datetime) -> Sequence[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Request historical and forecast data for all locations concurrently.
+
+    Args:
+        locations (Sequence[Location]): Locations to request the data for.
+        start_date (datetime): Start date of the historical data. 
+        end_date (datetime): End date of the historical data. 
+
+    Returns:
+        Sequence[Tuple[pd.DataFrame, pd.DataFrame]]: Historical and forecast data per location.
+    """
+    async with aiohttp.ClientSession() as session:
+        requests = []
+        for location in locations:
+            requests.extend([get_historical(session, location, start_date, end_date), get_forecast(session, location)])
+        data = await asyncio.gather(*requests)
+    return list(zip(data[::2], data[1::2]))
+
+
+def get_time_index(start_date: datetime, end_date: datetime) -> pd.DatetimeIndex:
+    """Return the hourly time index, as used in the OpenMeteo data.
+
+    Args:
+        start_date (datetime): First entry of the index.
+        end_date (datetime): Last entry of the index (inclusive).
+
+    Returns:
+        pd.DatetimeIndex: Hourly index between start and end date.
+    """
+    return pd.date_range(start_date, end_date, freq="h", name="time")
+
+
 def get_24h_average(series: pd.Series) -> pd.Series:
     """Average the Series over 24h.
 
@@ -183,62 +250,88 @@ def get_24h_average(series: pd.Series) -> pd.Series:
     Returns:
         pd.Series: Rolling average of the given data over 24 entries.
     """
-    return series.rolling(24).mean()
-
-
-def plot(locations: Sequence[Location]):
+    # Same as series.rolling(24).mean(), but via cumulative sums in a single pass.
+    # Windows containing NaNs (e.g. where historical and forecast data do not
+    # overlap) are set to NaN, as the NaNs would otherwise spread through the sums.
+    window = 24
+    values = series.to_numpy(dtype=np.float64)
+    valid = np.isfinite(values)
+
+    sums = np.zeros(values.size + 1)
+    np.cumsum(np.where(valid, values, 0.), out=sums[1:])
+    counts = np.zeros(values.size + 1, dtype=np.int64)
+    np.cumsum(valid, out=counts[1:])
+
+    average = np.full_like(values, np.nan)
+    if values.size >= window:
+        full = (counts[window:] - counts[:-window]) == window
+        average[window-1:] = np.where(full, (sums[window:] - sums[:-window]) / window, np.nan)
+    return pd.Series(average, index=series.index, name=series.name)
+
+
+def plot(locations: Sequence[Location], now: datetime):
     """Create a plot of the given locations, containing already the results of 
     the OpenMeteo forecast and historical data request.
 
     Args:
         locations (Sequence[Location]): Location objects with stored data as columns in a dataframe.
-        start_date (datetime): Start date of the historical data. 
+        now (datetime): Current date, marked in the plot. 
     """
 
-    fig = go.Figure()
-    fig.add_hline(y=25, line_width=1, line_dash="dash", line_color="red")
-    fig.add_hline(y=27, line_width=1, line_dash="dash", line_color="purple")
-    fig.add_vline(x=iso8601format(datetime.now()), line_width=1, line_dash="dash", line_color="black")
-
+    traces = []
     for idx, location in enumerate(locations):
         df = location.data
+        # plotly serializes numpy arrays much faster than pandas objects.
+        # The averages are aligned to df.index, so all traces share the same time array.
+        time = df.index.to_numpy()
+        forecast = df.forecast.to_numpy()
         forecast_24 = get_24h_average(df.forecast)
-        fig.add_trace(go.Scatter(
-            x=df.index, 
-            y=df.forecast, 
-            name=f"forecast",
-            legendgroup=location.name,
-            legendgrouptitle_text=location.name,
-            mode='lines', 
-            line=dict(color=get_color(idx, 0.2)),
-        ))
-        fig.add_trace(go.Scatter(
-            x=forecast_24.index, 
-            y=forecast_24, 
-            name="forecast av24h", 
-            legendgroup=location.name,
-            mode='lines', 
-            line=dict(dash="dash", color=get_color(idx)),
-        ))
-        
+        historical = df.historical.to_numpy()
         historical_24 = get_24h_average(df.historical)
-        fig.add_trace(go.Scatter(
-            x=df.index, 
-            y=df.historical, 
-            name="historical", 
-            legendgroup=location.name,
-            mode='lines',
-            line=dict(color=get_color(idx, 0.4))
-        ))
-        fig.add_trace(go.Scatter(
-            x=historical_24.index, 
-            y=historical_24, 
-            name="historical av24h", 
-            legendgroup=location.name,
-            mode='lines', 
-            line=dict(color=get_color(idx))
-        ))
-        
+        # WebGL, as it stays responsive for the dense hourly data.
+        # All traces use it, as WebGL traces are always drawn above SVG traces.
+        traces.extend([
+            go.Scattergl(
+                x=time, 
+                y=forecast, 
+                name=f"forecast",
+                legendgroup=location.name,
+                legendgrouptitle_text=location.name,
+                mode='lines', 
+                line=dict(color=get_color(idx, 0.2)),
+            ),
+            go.Scattergl(
+                x=time, 
+                y=forecast_24.to_numpy(), 
+                name="forecast av24h", 
+                legendgroup=location.name,
+                mode='lines', 
+                line=dict(dash="dash", color=get_color(idx)),
+            ),
+            go.Scattergl(
+                x=time, 
+                y=historical, 
+                name="historical", 
+                legendgroup=location.name,
+                mode='lines',
+                line=dict(color=get_color(idx, 0.4))
+            ),
+            go.Scattergl(
+                x=time, 
+                y=historical_24.to_numpy(), 
+                name="historical av24h", 
+                legendgroup=location.name,
+                mode='lines', 
+                line=dict(color=get_color(idx))
+            ),
+        ])
+
+    # create the figure from all traces at once, instead of adding them one by one
+    fig = go.Figure(data=traces)
+    fig.add_hline(y=25, line_width=1, line_dash="dash", line_color="red")
+    fig.add_hline(y=27, line_width=1, line_dash="dash", line_color="purple")
+    fig.add_vline(x=iso8601format(now), line_width=1, line_dash="dash", line_color="black")
+
     fig.update_layout(
         title=f"Temperature OpenMeteo",
         xaxis_title="Date",
@@ -252,15 +345,24 @@ def plot(locations: Sequence[Location]):
 if __name__ == "__main__":
     """Gather forecast and historical data and generate the plot."""
     start_date = datetime(2023, 6, 1)
+    now = datetime.now()  # use the same date for requesting and plotting
 
     locations = [
-        # BERN.copy(), 
-        GENEVA.copy()
+        # BERN, 
+        GENEVA
     ]
 
-    for location in locations:
-        df_hist = get_historical(location, start_date)
-        df_forecast = get_forecast(location)
-        location.data = pd.concat([df_hist, df_forecast], axis=1)
+    locations_with_data = []
+    all_data = asyncio.run(get_all_data(locations, start_date, now))
+    for location, (df_hist, df_forecast) in zip(locations, all_data):
+        time_index = get_time_index(start_date, df_forecast.index[-1])
+        location = location.with_data(pd.DataFrame(
+            {
+                "historical": df_hist.historical.reindex(time_index).to_numpy(),
+                "forecast": df_forecast.forecast.reindex(time_index).to_numpy(),
+            }, 
+            index=time_index
+        ))
+        locations_with_data.append(location)
 
-    plot(locations)
+    plot(locations_with_data, now)